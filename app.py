@@ -1,6 +1,7 @@
 import streamlit as st
 from utils import analyze_memory_local
-from poster_generator import generate_poster
+from poster_generator import generate_poster, generate_composite_poster
+from backends import available_backends
 
 st.set_page_config(
     page_title="City × Memory × Emotion — Art Poster Generator",
@@ -33,8 +34,26 @@ st.write("---")
 # ----------------------------
 st.subheader("Step 1 — 输入你的城市与记忆文本")
 
-city = st.text_input("城市名称（City）", placeholder="例如：Seoul / Nanjing / Tokyo ...")
-memory_text = st.text_area("写下你和这个城市的记忆：", height=180)
+poster_mode = st.radio("海报模式（Mode）", ["单幅海报（Single）", "多联拼贴（Composite）"], horizontal=True)
+composite_mode = poster_mode.startswith("多联")
+
+# 多联布局：(行, 列)
+COMPOSITE_LAYOUTS = {
+    "1 × 3 三联画（Triptych）": (1, 3),
+    "2 × 2 四宫格": (2, 2),
+    "3 × 3 九宫格": (3, 3),
+}
+
+if composite_mode:
+    layout_name = st.selectbox("拼贴布局（Layout）", list(COMPOSITE_LAYOUTS))
+    panels_text = st.text_area(
+        "每行一个面板：城市 | 记忆（行数需与布局格数一致）",
+        height=220,
+        placeholder="Tokyo | 深夜的秋叶原霓虹\nParis | 塞纳河边的咖啡馆\nBusan | 海边的风",
+    )
+else:
+    city = st.text_input("城市名称（City）", placeholder="例如：Seoul / Nanjing / Tokyo ...")
+    memory_text = st.text_area("写下你和这个城市的记忆：", height=180)
 
 st.write("---")
 
@@ -61,6 +80,14 @@ st.sidebar.header("🎲 随机种子 Seed")
 manual_seed = st.sidebar.number_input("Seed（可选，不改则自动随文本变化）", value=42, step=1)
 use_auto_seed = st.sidebar.checkbox("自动根据城市 + 文本生成种子", value=True)
 
+st.sidebar.header("⚙️ 计算后端（Compute Backend）")
+compute_backend = st.sidebar.selectbox("Backend（numba 未安装时自动回退到 numpy）", ["auto"] + available_backends())
+
+st.sidebar.header("📐 导出格式（Export Format）")
+export_format = st.sidebar.selectbox(
+    "Format（SVG / JSON 为矢量叠加层，适合大幅印刷）", ["PNG", "SVG", "JSON"]
+)
+
 st.sidebar.write("----")
 generate_btn = st.sidebar.button("🎨 生成海报 Generate Poster")
 
@@ -69,7 +96,7 @@ generate_btn = st.sidebar.button("🎨 生成海报 Generate Poster")
 # ----------------------------
 st.subheader("Step 2 — 文本情绪与色彩分析结果")
 
-if generate_btn:
+if generate_btn and not composite_mode:
     if not city.strip() or not memory_text.strip():
         st.error("城市和记忆文本不能为空！")
         st.stop()
@@ -108,13 +135,85 @@ if generate_btn:
             pastel_softness=pastel_softness,
             pastel_grain=pastel_grain,
             pastel_blend=pastel_blend,
+            backend=compute_backend,
+            output_format=export_format.lower(),
+        )
+
+        export_mime = {"PNG": "image/png", "SVG": "image/svg+xml", "JSON": "application/json"}[export_format]
+
+        if export_format == "PNG":
+            st.image(poster_bytes, caption="🎨 海报生成结果", use_column_width=True)
+        elif export_format == "SVG":
+            st.image(poster_bytes.decode("utf-8"), caption="🎨 海报生成结果（SVG 矢量）", use_column_width=True)
+        else:
+            st.info("已生成 JSON 显示列表（背景图 + 矢量几何），可直接下载用于印刷排版。")
+
+        st.download_button(
+            f"📥 下载 {export_format} 文件",
+            data=poster_bytes,
+            file_name=f"{city}_art_poster.{export_format.lower()}",
+            mime=export_mime
+        )
+
+
+# ----------------------------
+# 多联拼贴模式（Composite）
+# ----------------------------
+if generate_btn and composite_mode:
+    rows, cols = COMPOSITE_LAYOUTS[layout_name]
+
+    entries = []
+    for line in panels_text.splitlines():
+        if "|" not in line:
+            continue
+        panel_city, panel_memory = (part.strip() for part in line.split("|", 1))
+        if panel_city and panel_memory:
+            entries.append((panel_city, panel_memory))
+
+    if len(entries) != rows * cols:
+        st.error(f"当前布局需要 {rows * cols} 个面板，实际输入了 {len(entries)} 个（格式：城市 | 记忆）。")
+        st.stop()
+
+    panels = []
+    for panel_city, panel_memory in entries:
+        analysis = analyze_memory_local(panel_city, panel_memory)
+        analysis["memory_text"] = panel_memory
+        panels.append(analysis)
+
+    st.json([{k: p[k] for k in ("city", "mood", "intensity", "summary")} for p in panels])
+
+    if use_auto_seed:
+        seed = abs(hash("".join(c + m for c, m in entries))) % 10**6
+    else:
+        seed = int(manual_seed)
+
+    st.write("---")
+    st.subheader("Step 3 — 并行生成多联拼贴海报")
+
+    with st.spinner("正在并行渲染各个面板，请稍候..."):
+        poster_bytes = generate_composite_poster(
+            panels=panels,
+            rows=rows,
+            cols=cols,
+            seed=seed,
+            emotion_link=emotion_link,
+            mist_strength=mist_strength,
+            mist_smoothness=mist_smoothness,
+            mist_glow=mist_glow,
+            wc_spread=wc_spread,
+            wc_layers=wc_layers,
+            wc_saturation=wc_saturation,
+            pastel_softness=pastel_softness,
+            pastel_grain=pastel_grain,
+            pastel_blend=pastel_blend,
+            backend=compute_backend,
         )
 
-        st.image(poster_bytes, caption="🎨 海报生成结果", use_column_width=True)
+        st.image(poster_bytes, caption="🖼 多联拼贴结果（导出格式固定为 PNG）", use_column_width=True)
 
         st.download_button(
             "📥 下载 PNG 文件",
             data=poster_bytes,
-            file_name=f"{city}_art_poster.png",
+            file_name=f"composite_{rows}x{cols}_art_poster.png",
             mime="image/png"
         )
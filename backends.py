@@ -0,0 +1,193 @@
+import os
+import warnings
+from functools import lru_cache
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # optional dependency
+    numba = None
+
+RGB = Tuple[int, int, int]
+
+BACKEND_ENV_VAR = "POSTER_BACKEND"
+DEFAULT_BACKEND = "numpy"
+
+
+# ---------------------------------------------------------
+# Shared, palette-independent fields
+# ---------------------------------------------------------
+@lru_cache(maxsize=8)
+def _gradient_fields(size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (t_diag, d_center) for a square canvas; cached per size."""
+    w = h = size
+    ys, xs = np.mgrid[0:h, 0:w].astype("float64")
+    t_diag = (xs / (w - 1) + ys / (h - 1)) / 2.0
+    d_center = np.sqrt((xs - w / 2) ** 2 + (ys - h / 2) ** 2) / (0.75 * w)
+    d_center = np.clip(d_center, 0.0, 1.0)
+    t_diag.flags.writeable = False
+    d_center.flags.writeable = False
+    return t_diag, d_center
+
+
+# ---------------------------------------------------------
+# NumPy backend (default)
+# ---------------------------------------------------------
+class NumpyBackend:
+    """Vectorized NumPy implementation of the per-pixel kernels."""
+
+    name = "numpy"
+
+    def gradient(self, size: int, c1: RGB, c2: RGB, c3: RGB, mood_intensity: float) -> np.ndarray:
+        """Diagonal + center-distance gradient as a (size, size, 3) uint8 array."""
+        t_diag, d_center = _gradient_fields(size)
+        t = t_diag[..., None]
+        factor = ((1.0 - d_center) * 0.8 * (0.4 + 0.6 * mood_intensity))[..., None]
+
+        c1 = np.asarray(c1, dtype="float64")
+        c2 = np.asarray(c2, dtype="float64")
+        c3 = np.asarray(c3, dtype="float64")
+
+        # Truncate after each interpolation step, like the per-pixel int() casts
+        c_diag = np.trunc(c1 * (1 - t) + c2 * t)
+        return (c_diag * (1 - factor) + c3 * factor).astype("uint8")
+
+    def scale_clip(self, arr: np.ndarray, gain: float) -> np.ndarray:
+        """Multiply a uint8 image by gain and clip back into uint8."""
+        out = arr.astype("float32")
+        out *= gain
+        return np.clip(out, 0, 255).astype("uint8")
+
+    def lift_grain(self, arr: np.ndarray, gain: float, noise: Optional[np.ndarray] = None) -> np.ndarray:
+        """Brightness lift followed by optional additive grain, clipped to uint8."""
+        out = self.scale_clip(arr, gain)
+        if noise is None:
+            return out
+        out = out.astype("float32") + noise
+        return np.clip(out, 0, 255).astype("uint8")
+
+
+# ---------------------------------------------------------
+# Numba backend (optional)
+# ---------------------------------------------------------
+if numba is not None:
+
+    @numba.njit(parallel=True, cache=True)
+    def _nb_gradient(size, c1, c2, c3, mood_intensity):
+        w = h = size
+        out = np.empty((h, w, 3), dtype=np.uint8)
+        for y in numba.prange(h):
+            ty = y / (h - 1)
+            for x in range(w):
+                tx = x / (w - 1)
+                d_center = ((x - w / 2) ** 2 + (y - h / 2) ** 2) ** 0.5 / (0.75 * w)
+                d_center = max(0.0, min(1.0, d_center))
+                t_diag = (tx + ty) / 2.0
+                factor = (1.0 - d_center) * 0.8 * (0.4 + 0.6 * mood_intensity)
+                for c in range(3):
+                    c_diag = int(c1[c] * (1 - t_diag) + c2[c] * t_diag)
+                    out[y, x, c] = int(c_diag * (1 - factor) + c3[c] * factor)
+        return out
+
+    @numba.njit(parallel=True, cache=True)
+    def _nb_scale_clip(arr, gain):
+        h, w, ch = arr.shape
+        out = np.empty_like(arr)
+        for y in numba.prange(h):
+            for x in range(w):
+                for c in range(ch):
+                    v = np.float32(arr[y, x, c]) * gain
+                    out[y, x, c] = np.uint8(min(max(v, 0.0), 255.0))
+        return out
+
+    @numba.njit(parallel=True, cache=True)
+    def _nb_lift_grain(arr, gain, noise):
+        h, w, ch = arr.shape
+        out = np.empty_like(arr)
+        for y in numba.prange(h):
+            for x in range(w):
+                n = noise[y, x, 0]
+                for c in range(ch):
+                    v = np.float32(arr[y, x, c]) * gain
+                    v = np.float32(np.uint8(min(max(v, 0.0), 255.0))) + n
+                    out[y, x, c] = np.uint8(min(max(v, 0.0), 255.0))
+        return out
+
+
+class NumbaBackend(NumpyBackend):
+    """JIT-compiled kernels, fused and parallelized across cores."""
+
+    name = "numba"
+
+    def gradient(self, size: int, c1: RGB, c2: RGB, c3: RGB, mood_intensity: float) -> np.ndarray:
+        return _nb_gradient(
+            int(size),
+            np.asarray(c1, dtype="float64"),
+            np.asarray(c2, dtype="float64"),
+            np.asarray(c3, dtype="float64"),
+            float(mood_intensity),
+        )
+
+    def scale_clip(self, arr: np.ndarray, gain: float) -> np.ndarray:
+        return _nb_scale_clip(np.ascontiguousarray(arr), np.float32(gain))
+
+    def lift_grain(self, arr: np.ndarray, gain: float, noise: Optional[np.ndarray] = None) -> np.ndarray:
+        if noise is None:
+            return self.scale_clip(arr, gain)
+        return _nb_lift_grain(
+            np.ascontiguousarray(arr),
+            np.float32(gain),
+            np.ascontiguousarray(noise, dtype="float32"),
+        )
+
+
+# ---------------------------------------------------------
+# Backend selection
+# ---------------------------------------------------------
+_BACKENDS = {
+    "numpy": NumpyBackend,
+    "numba": NumbaBackend,
+}
+
+
+def available_backends() -> list:
+    """Names of the backends usable in this environment."""
+    names = ["numpy"]
+    if numba is not None:
+        names.append("numba")
+    return names
+
+
+def set_num_threads(n: int) -> None:
+    """Limit the threads used by parallel kernels (no-op without numba)."""
+    if numba is not None:
+        numba.set_num_threads(max(1, min(n, numba.config.NUMBA_NUM_THREADS)))
+
+
+def get_backend(name: Union[str, NumpyBackend, None] = None) -> NumpyBackend:
+    """
+    Resolve a compute backend by name.
+
+    - A backend instance is returned unchanged.
+    - None reads the POSTER_BACKEND environment variable (default: numpy).
+    - "auto" picks numba when installed, otherwise numpy.
+    - An unavailable backend falls back to numpy with a warning.
+    """
+    if isinstance(name, NumpyBackend):
+        return name
+
+    name = (name or os.environ.get(BACKEND_ENV_VAR) or DEFAULT_BACKEND).strip().lower()
+
+    if name == "auto":
+        name = "numba" if numba is not None else "numpy"
+
+    if name not in _BACKENDS:
+        warnings.warn(f"Unknown compute backend {name!r}; falling back to numpy.")
+        name = "numpy"
+    elif name not in available_backends():
+        warnings.warn(f"Compute backend {name!r} is not installed; falling back to numpy.")
+        name = "numpy"
+
+    return _BACKENDS[name]()
@@ -0,0 +1,98 @@
+"""
+Per-stage timing of the compute backends.
+
+Usage:
+    python benchmark.py [--size 1024] [--repeat 5]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from backends import available_backends, get_backend
+from poster_generator import generate_composite_poster, generate_poster
+
+PALETTE = [(120, 160, 200), (220, 200, 180), (90, 110, 150)]
+
+STYLE = dict(
+    emotion_link=0.7,
+    mist_strength=0.6,
+    mist_smoothness=0.7,
+    mist_glow=0.4,
+    wc_spread=0.45,
+    wc_layers=2,
+    wc_saturation=0.6,
+    pastel_softness=0.5,
+    pastel_grain=0.25,
+    pastel_blend=0.6,
+)
+
+PANEL = dict(city="Tokyo", memory_text="anime night by the harbor", mood="calm", palette=PALETTE, intensity=0.6)
+
+
+def _time(fn, repeat: int) -> float:
+    """Best-of-N wall time in milliseconds (first call warms up JIT caches)."""
+    fn()
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000.0
+
+
+def _stages(backend, size: int):
+    rng = np.random.default_rng(0)
+    img = rng.integers(0, 256, (size, size, 3), dtype=np.uint8)
+    noise = rng.normal(0, 3, (size, size, 1)).astype("float32")
+    c1, c2, c3 = PALETTE
+
+    return {
+        "gradient": lambda: backend.gradient(size, c1, c2, c3, 0.6),
+        "glow scale_clip": lambda: backend.scale_clip(img, 1.13),
+        "pastel lift_grain": lambda: backend.lift_grain(img, 1.04, noise),
+        "generate_poster": lambda: generate_poster(
+            city=PANEL["city"],
+            memory_text=PANEL["memory_text"],
+            mood=PANEL["mood"],
+            palette=PANEL["palette"],
+            mood_intensity=PANEL["intensity"],
+            seed=7,
+            backend=backend,
+            size=size,
+            **STYLE,
+        ),
+        "composite 3x3": lambda: generate_composite_poster(
+            panels=[PANEL] * 9,
+            rows=3,
+            cols=3,
+            seed=7,
+            panel_size=size // 3,
+            backend=backend.name,
+            **STYLE,
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=1024)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    names = available_backends()
+    results = {}
+    for name in names:
+        stages = _stages(get_backend(name), args.size)
+        results[name] = {stage: _time(fn, args.repeat) for stage, fn in stages.items()}
+
+    stages = list(results[names[0]])
+    header = f"{'stage':<20}" + "".join(f"{n + ' (ms)':>14}" for n in names)
+    print(header)
+    print("-" * len(header))
+    for stage in stages:
+        print(f"{stage:<20}" + "".join(f"{results[n][stage]:>14.1f}" for n in names))
+
+
+if __name__ == "__main__":
+    main()
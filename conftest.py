@@ -0,0 +1,2 @@
+# Marks the repo root for pytest, which puts it on sys.path so the tests
+# can import the top-level modules (backends, poster_generator, utils).
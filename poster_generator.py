@@ -1,22 +1,32 @@
+import atexit
+import base64
 import io
+import json
+import multiprocessing
+import os
 import random
-from typing import List, Tuple
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple, Union
 
 import numpy as np
 from PIL import Image, ImageFilter, ImageDraw
 
+from backends import NumpyBackend, get_backend, set_num_threads
+
 RGB = Tuple[int, int, int]
 
+# Canvas size the pixel-based constants below were tuned for
+BASE_SIZE = 1024
+
 
 # ---------------------------------------------------------
 # Basic Utilities
 # ---------------------------------------------------------
-def _lerp_color(c1: RGB, c2: RGB, t: float) -> RGB:
-    return (
-        int(c1[0] * (1 - t) + c2[0] * t),
-        int(c1[1] * (1 - t) + c2[1] * t),
-        int(c1[2] * (1 - t) + c2[2] * t),
-    )
+def _px_scale(w: int, h: int) -> float:
+    """Scale factor for pixel constants relative to BASE_SIZE."""
+    return min(w, h) / BASE_SIZE
 
 
 def _to_image_bytes(img: Image.Image) -> bytes:
@@ -56,8 +66,9 @@ def _normalize_palette(palette) -> List[RGB]:
 # ---------------------------------------------------------
 # Base Gradient Background
 # ---------------------------------------------------------
-def _generate_base_gradient(size: int, palette, mood_intensity: float) -> Image.Image:
+def _generate_base_gradient(size: int, palette, mood_intensity: float, backend=None) -> Image.Image:
     """Generate a diagonal + center-distance-based soft gradient."""
+    backend = get_backend(backend)
     palette = _normalize_palette(palette)
 
     if len(palette) == 1:
@@ -67,43 +78,34 @@ def _generate_base_gradient(size: int, palette, mood_intensity: float) -> Image.
 
     c1, c2, c3 = palette[0], palette[1], palette[2]
 
-    w = h = size
-    arr = np.zeros((h, w, 3), dtype=np.uint8)
-
-    for y in range(h):
-        for x in range(w):
-            tx = x / (w - 1)
-            ty = y / (h - 1)
-            d_center = ((x - w / 2) ** 2 + (y - h / 2) ** 2) ** 0.5 / (0.75 * w)
-            d_center = max(0.0, min(1.0, d_center))
-
-            t_diag = (tx + ty) / 2.0
-            c_diag = _lerp_color(c1, c2, t_diag)
-
-            factor = (1.0 - d_center) * 0.8 * (0.4 + 0.6 * mood_intensity)
-            c_final = _lerp_color(c_diag, c3, factor)
-            arr[y, x, :] = c_final
+    arr = backend.gradient(size, c1, c2, c3, mood_intensity)
 
     img = Image.fromarray(arr, mode="RGB")
-    img = img.filter(ImageFilter.GaussianBlur(radius=1.8))
+    img = img.filter(ImageFilter.GaussianBlur(radius=1.8 * _px_scale(size, size)))
     return img
 
 
 # ---------------------------------------------------------
 # Mist Layer
 # ---------------------------------------------------------
-def _apply_mist_layer(img: Image.Image, strength: float, smoothness: float, glow: float) -> Image.Image:
-    """Apply atmospheric mist + glow."""
+def _apply_mist_layer(
+    img: Image.Image, strength: float, smoothness: float, glow: float, backend=None, scale: Optional[float] = None
+) -> Image.Image:
+    """Apply atmospheric mist + glow; scale overrides the size-derived pixel scale."""
     if strength <= 0 and glow <= 0:
         return img
 
+    backend = get_backend(backend)
+
     w, h = img.size
+    if scale is None:
+        scale = _px_scale(w, h)
     base = img.convert("RGB")
 
     # Fog / mist texture
     if strength > 0:
         noise = np.random.rand(h, w).astype("float32")
-        mist_radius = 15 + smoothness * 25
+        mist_radius = (15 + smoothness * 25) * scale
         mist_layer = Image.fromarray((noise * 255).astype("uint8"), mode="L")
         mist_layer = mist_layer.filter(ImageFilter.GaussianBlur(radius=mist_radius))
 
@@ -118,13 +120,11 @@ def _apply_mist_layer(img: Image.Image, strength: float, smoothness: float, glow
 
     # Glow bloom
     if glow > 0:
-        glow_radius = 6 + glow * 20
+        glow_radius = (6 + glow * 20) * scale
         glow_layer = base.filter(ImageFilter.GaussianBlur(radius=glow_radius))
         glow_layer = Image.blend(base, glow_layer, alpha=0.55)
 
-        enhancer = np.array(glow_layer).astype("float32")
-        enhancer = enhancer * (1.03 + glow * 0.25)
-        enhancer = np.clip(enhancer, 0, 255).astype("uint8")
+        enhancer = backend.scale_clip(np.array(glow_layer), 1.03 + glow * 0.25)
         glow_layer = Image.fromarray(enhancer, mode="RGB")
 
         base = Image.blend(base, glow_layer, alpha=0.55)
@@ -167,7 +167,7 @@ def _apply_watercolor_layer(img: Image.Image, palette, spread: float, layers: in
             bbox = (cx - rx, cy - ry, cx + rx, cy + ry)
             draw.ellipse(bbox, fill=(r, g, b, alpha))
 
-        blur_radius = 8 + spread * 30
+        blur_radius = (8 + spread * 30) * _px_scale(w, h)
         overlay = overlay.filter(ImageFilter.GaussianBlur(radius=blur_radius))
         base = Image.alpha_composite(base.convert("RGBA"), overlay).convert("RGB")
 
@@ -177,31 +177,34 @@ def _apply_watercolor_layer(img: Image.Image, palette, spread: float, layers: in
 # ---------------------------------------------------------
 # Pastel Softening Layer
 # ---------------------------------------------------------
-def _apply_pastel_layer(img: Image.Image, softness: float, grain_amount: float, blend_ratio: float) -> Image.Image:
-    """Soft pastel look."""
+def _apply_pastel_layer(
+    img: Image.Image,
+    softness: float,
+    grain_amount: float,
+    blend_ratio: float,
+    backend=None,
+    scale: Optional[float] = None,
+) -> Image.Image:
+    """Soft pastel look; scale overrides the size-derived pixel scale."""
+    backend = get_backend(backend)
     base = img.convert("RGB")
     w, h = base.size
+    if scale is None:
+        scale = _px_scale(w, h)
 
     # Soft blur
     if softness > 0:
-        blur_radius = 1.5 + softness * 6
+        blur_radius = (1.5 + softness * 6) * scale
         soft = base.filter(ImageFilter.GaussianBlur(radius=blur_radius))
     else:
         soft = base
 
-    # Slight brightness lift
-    arr = np.array(soft).astype("float32")
-    arr *= 1.04
-    arr = np.clip(arr, 0, 255).astype("uint8")
-    soft = Image.fromarray(arr, mode="RGB")
-
-    # Add grain
+    # Slight brightness lift + grain (fused)
+    noise = None
     if grain_amount > 0:
         noise = np.random.normal(0, grain_amount * 12, (h, w, 1)).astype("float32")
-        arr = np.array(soft).astype("float32")
-        arr = arr + noise
-        arr = np.clip(arr, 0, 255).astype("uint8")
-        soft = Image.fromarray(arr, mode="RGB")
+    arr = backend.lift_grain(np.array(soft), 1.04, noise)
+    soft = Image.fromarray(arr, mode="RGB")
 
     # Pastel overlay tone
     overlay = Image.new("RGB", (w, h), (245, 245, 248))
@@ -300,16 +303,24 @@ def _detect_city_tags(city: str, memory_text: str) -> List[str]:
 
 
 # ---------------------------------------------------------
-# City Style Overlay Layer
+# City Style Overlay: display list
 # ---------------------------------------------------------
-def _apply_city_style_layer(img: Image.Image, city: str, palette, tags: List[str], strength: float) -> Image.Image:
-    """Add city-specific stylistic overlay elements."""
-    palette = _city_accent_palette(city, palette)
-    w, h = img.size
-    base = img.convert("RGB")
+OVERLAY_BLUR_RADIUS = 3.0
+FOG_BLUR_RADIUS = 35
 
-    overlay = Image.new("RGBA", (w, h), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(overlay)
+
+def _city_style_display_list(w: int, h: int, city: str, palette, tags: List[str], strength: float) -> List[dict]:
+    """
+    Build the city overlay as a resolution-independent display list.
+
+    Each op is a dict with an "op" key ("lines", "line", "rect", "ellipse",
+    "cells" or "fog") and RGBA "fill" colors, in canvas coordinates of w x h.
+    Boxes are inclusive, as in ImageDraw. A "cells" op is the pixel grid: a
+    shared "fills" table plus [x, y, fill_index] squares of side "cell".
+    """
+    palette = _city_accent_palette(city, palette)
+    scale = _px_scale(w, h)
+    ops: List[dict] = []
 
     def pick_color(vivid: bool = False):
         c = random.choice(palette)
@@ -328,15 +339,20 @@ def _apply_city_style_layer(img: Image.Image, city: str, palette, tags: List[str
         for i in range(n):
             color = pick_color()
             alpha = int(45 + 80 * strength)
-            thickness = int(8 + 35 * strength)
+            thickness = max(1, int((8 + 35 * strength) * scale))
             y0 = int(h * (0.3 + 0.4 * i / n))
-            for x in range(0, w, 6):
-                y = y0 + int(np.sin(x / 40.0 + i) * 18)
-                draw.line(
-                    [(x, y), (x + 10, y)],
-                    fill=(color[0], color[1], color[2], alpha),
-                    width=thickness,
-                )
+            step = max(1, round(6 * scale))
+            seg = max(1, round(10 * scale))
+            segments = []
+            for x in range(0, w, step):
+                y = y0 + int(np.sin(x / (40.0 * scale) + i) * (18 * scale))
+                segments.append((x, y, x + seg, y))
+            ops.append({
+                "op": "lines",
+                "segments": segments,
+                "fill": (color[0], color[1], color[2], alpha),
+                "width": thickness,
+            })
 
     # Vertical neon bars
     if "vertical_neon" in tags:
@@ -347,24 +363,30 @@ def _apply_city_style_layer(img: Image.Image, city: str, palette, tags: List[str
             x = random.randint(0, w)
             top = random.randint(0, int(h * 0.1))
             bottom = random.randint(int(h * 0.6), h)
-            width = random.randint(6, 16)
-            draw.rectangle(
-                (x, top, x + width, bottom),
-                fill=(color[0], color[1], color[2], alpha),
-            )
+            width = random.randint(max(1, round(6 * scale)), max(1, round(16 * scale)))
+            ops.append({
+                "op": "rect",
+                "box": (x, top, x + width, bottom),
+                "fill": (color[0], color[1], color[2], alpha),
+            })
 
     # Pixel grid blocks
     if "pixel_grid" in tags:
-        cell = int(18 - 10 * strength) if strength > 0 else 18
+        cell = int((18 - 10 * strength) * scale) if strength > 0 else int(18 * scale)
+        cell = max(1, cell)
+        fills: List[tuple] = []
+        cells = []
         for y in range(0, h, cell):
             for x in range(0, w, cell):
                 if random.random() < 0.23 + 0.35 * strength:
                     color = pick_color(vivid=True)
                     alpha = int(80 + 120 * strength)
-                    draw.rectangle(
-                        (x, y, x + cell, y + cell),
-                        fill=(color[0], color[1], color[2], alpha),
-                    )
+                    fill = (color[0], color[1], color[2], alpha)
+                    if fill not in fills:
+                        fills.append(fill)
+                    cells.append((x, y, fills.index(fill)))
+        if cells:
+            ops.append({"op": "cells", "cell": cell, "fills": fills, "cells": cells})
 
     # Paris arch shapes
     if "arches" in tags:
@@ -379,14 +401,9 @@ def _apply_city_style_layer(img: Image.Image, city: str, palette, tags: List[str
             left = x_center - width // 2
             right = x_center + width // 2
             top = int(h * (0.38 + 0.1 * random.random()))
-            draw.rectangle(
-                (left, (top + base_y) // 2, right, base_y),
-                fill=(color[0], color[1], color[2], alpha),
-            )
-            draw.ellipse(
-                (left, top, right, top + (base_y - top) // 2),
-                fill=(color[0], color[1], color[2], alpha),
-            )
+            fill = (color[0], color[1], color[2], alpha)
+            ops.append({"op": "rect", "box": (left, (top + base_y) // 2, right, base_y), "fill": fill})
+            ops.append({"op": "ellipse", "box": (left, top, right, top + (base_y - top) // 2), "fill": fill})
 
     # NYC chaos strokes
     if "chaos_lines" in tags:
@@ -396,27 +413,262 @@ def _apply_city_style_layer(img: Image.Image, city: str, palette, tags: List[str
             alpha = int(60 + 150 * strength)
             x1 = random.randint(0, w)
             y1 = random.randint(0, h)
-            x2 = x1 + random.randint(-110, 110)
-            y2 = y1 + random.randint(-90, 90)
-            draw.line(
-                (x1, y1, x2, y2),
-                fill=(color[0], color[1], color[2], alpha),
-                width=random.randint(1, 4),
-            )
-
-    # Fog layer for London
+            x2 = x1 + random.randint(-round(110 * scale), round(110 * scale))
+            y2 = y1 + random.randint(-round(90 * scale), round(90 * scale))
+            ops.append({
+                "op": "line",
+                "points": (x1, y1, x2, y2),
+                "fill": (color[0], color[1], color[2], alpha),
+                "width": random.randint(1, 4),
+            })
+
+    # Fog layer for London (raster texture, generated when rendered)
     if "fog_overlay" in tags:
-        fog_noise = np.random.rand(h, w).astype("float32")
-        fog = Image.fromarray((fog_noise * 255).astype("uint8"), mode="L")
-        fog = fog.filter(ImageFilter.GaussianBlur(radius=35))
-        fog_rgb = Image.merge("RGBA", (fog, fog, fog, fog))
-        overlay = Image.alpha_composite(overlay, fog_rgb)
+        ops.append({"op": "fog", "radius": FOG_BLUR_RADIUS * scale})
+
+    return ops
+
+
+def _fog_layer(w: int, h: int, radius: float) -> Image.Image:
+    """Blurred noise used as a white, self-masked fog texture."""
+    fog_noise = np.random.rand(h, w).astype("float32")
+    fog = Image.fromarray((fog_noise * 255).astype("uint8"), mode="L")
+    fog = fog.filter(ImageFilter.GaussianBlur(radius=radius))
+    return Image.merge("RGBA", (fog, fog, fog, fog))
+
+
+def _rasterize_display_list(ops: List[dict], w: int, h: int) -> Image.Image:
+    """Rasterize a display list onto a transparent RGBA overlay."""
+    overlay = Image.new("RGBA", (w, h), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(overlay)
+
+    for op in ops:
+        kind = op["op"]
+        if kind == "lines":
+            for x1, y1, x2, y2 in op["segments"]:
+                draw.line([(x1, y1), (x2, y2)], fill=op["fill"], width=op["width"])
+        elif kind == "line":
+            draw.line(op["points"], fill=op["fill"], width=op["width"])
+        elif kind == "rect":
+            draw.rectangle(op["box"], fill=op["fill"])
+        elif kind == "ellipse":
+            draw.ellipse(op["box"], fill=op["fill"])
+        elif kind == "cells":
+            cell = op["cell"]
+            for x, y, i in op["cells"]:
+                draw.rectangle((x, y, x + cell, y + cell), fill=op["fills"][i])
+        elif kind == "fog":
+            overlay = Image.alpha_composite(overlay, _fog_layer(w, h, op["radius"]))
+            draw = ImageDraw.Draw(overlay)
+
+    return overlay
+
+
+# ---------------------------------------------------------
+# City Style Overlay Layer
+# ---------------------------------------------------------
+def _apply_city_style_layer(img: Image.Image, city: str, palette, tags: List[str], strength: float) -> Image.Image:
+    """Add city-specific stylistic overlay elements."""
+    w, h = img.size
+    base = img.convert("RGB")
+
+    ops = _city_style_display_list(w, h, city, palette, tags, strength)
+    overlay = _rasterize_display_list(ops, w, h)
 
-    overlay = overlay.filter(ImageFilter.GaussianBlur(radius=3.0))
+    overlay = overlay.filter(ImageFilter.GaussianBlur(radius=OVERLAY_BLUR_RADIUS * _px_scale(w, h)))
     result = Image.alpha_composite(base.convert("RGBA"), overlay).convert("RGB")
     return result
 
 
+# ---------------------------------------------------------
+# Vector Export (SVG / JSON display list)
+# ---------------------------------------------------------
+def _embed_png(img: Image.Image, size: int) -> str:
+    """Downscale an image to `size` px on its long side and return base64 PNG."""
+    w, h = img.size
+    scale = min(1.0, size / float(max(w, h)))
+    if scale < 1.0:
+        img = img.resize((max(1, round(w * scale)), max(1, round(h * scale))), Image.LANCZOS)
+    return base64.b64encode(_to_image_bytes(img)).decode("ascii")
+
+
+def _resolve_vector_ops(ops: List[dict], w: int, h: int, embed_size: int) -> List[dict]:
+    """Replace raster-only ops (fog) with embedded, downscaled PNG data."""
+    resolved = []
+    for op in ops:
+        if op["op"] == "fog":
+            op = dict(op, data=_embed_png(_fog_layer(w, h, op["radius"]), embed_size))
+        resolved.append(op)
+    return resolved
+
+
+def _display_list_to_json(background: Image.Image, ops: List[dict], embed_size: int) -> bytes:
+    """Serialize background + overlay display list as compact JSON."""
+    w, h = background.size
+    doc = {
+        "width": w,
+        "height": h,
+        "background": {"mime": "image/png", "data": _embed_png(background, embed_size)},
+        "overlay_blur": OVERLAY_BLUR_RADIUS * _px_scale(w, h),
+        # Later ops overwrite earlier ones (ImageDraw semantics), no alpha stacking
+        "composite": "replace",
+        "ops": _resolve_vector_ops(ops, w, h, embed_size),
+    }
+    return json.dumps(doc, separators=(",", ":")).encode("utf-8")
+
+
+def _display_list_to_svg(background: Image.Image, ops: List[dict], embed_size: int) -> bytes:
+    """Serialize background + overlay display list as a scalable SVG."""
+    w, h = background.size
+
+    def paint(fill, attr: str) -> str:
+        r, g, b, a = fill
+        return f'{attr}="#{r:02x}{g:02x}{b:02x}" {attr}-opacity="{a / 255:.3f}"'
+
+    def image(data: str) -> str:
+        return (
+            f'<image x="0" y="0" width="{w}" height="{h}" preserveAspectRatio="none" '
+            f'xlink:href="data:image/png;base64,{data}"/>'
+        )
+
+    body = []
+    for op in _resolve_vector_ops(ops, w, h, embed_size):
+        kind = op["op"]
+        if kind == "lines":
+            d = " ".join(f"M{x1} {y1}L{x2} {y2}" for x1, y1, x2, y2 in op["segments"])
+            body.append(f'<path d="{d}" fill="none" {paint(op["fill"], "stroke")} stroke-width="{op["width"]}"/>')
+        elif kind == "line":
+            x1, y1, x2, y2 = op["points"]
+            body.append(
+                f'<line x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}" '
+                f'{paint(op["fill"], "stroke")} stroke-width="{op["width"]}"/>'
+            )
+        elif kind == "rect":
+            x0, y0, x1, y1 = op["box"]
+            body.append(
+                f'<rect x="{x0}" y="{y0}" width="{x1 - x0 + 1}" height="{y1 - y0 + 1}" {paint(op["fill"], "fill")}/>'
+            )
+        elif kind == "ellipse":
+            x0, y0, x1, y1 = op["box"]
+            body.append(
+                f'<ellipse cx="{(x0 + x1) / 2}" cy="{(y0 + y1) / 2}" rx="{(x1 - x0) / 2}" ry="{(y1 - y0) / 2}" '
+                f'{paint(op["fill"], "fill")}/>'
+            )
+        elif kind == "cells":
+            # One path per fill; half-open squares tile without the 1px
+            # overlap that would otherwise blend twice along every edge.
+            cell = op["cell"]
+            paths = [[] for _ in op["fills"]]
+            for x, y, i in op["cells"]:
+                paths[i].append(f"M{x} {y}h{cell}v{cell}h-{cell}z")
+            for fill, d in zip(op["fills"], paths):
+                body.append(f'<path d="{"".join(d)}" {paint(fill, "fill")}/>')
+        elif kind == "fog":
+            body.append(image(op["data"]))
+
+    svg = "\n".join([
+        f'<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" viewBox="0 0 {w} {h}" width="{w}" height="{h}">',
+        "<defs>",
+        '<filter id="soften" x="-5%" y="-5%" width="110%" height="110%">',
+        f'<feGaussianBlur stdDeviation="{OVERLAY_BLUR_RADIUS * _px_scale(w, h):g}"/>',
+        "</filter>",
+        "</defs>",
+        image(_embed_png(background, embed_size)),
+        '<g filter="url(#soften)">',
+        *body,
+        "</g>",
+        "</svg>",
+    ])
+    return svg.encode("utf-8")
+
+
+# ---------------------------------------------------------
+# Background Pipeline (gradient → mist → watercolor → pastel)
+# ---------------------------------------------------------
+def _seed_int(seed) -> int:
+    try:
+        return int(seed)
+    except Exception:
+        return 42
+
+
+def _modulate_style(
+    mood_intensity: float,
+    emotion_link: float,
+    mist_strength: float,
+    wc_spread: float,
+    wc_layers: int,
+    pastel_softness: float,
+    pastel_grain: float,
+    pastel_blend: float,
+) -> dict:
+    """Emotion-driven strength modulation of the raw slider values."""
+    factor = 0.35 + 0.65 * emotion_link
+    return dict(
+        mist_strength=mist_strength * factor * (0.7 + 0.6 * mood_intensity),
+        wc_spread=wc_spread * factor * (0.6 + 0.7 * mood_intensity),
+        wc_layers=max(1, int(wc_layers * (0.6 + 0.8 * mood_intensity))),
+        pastel_softness=pastel_softness * factor * (0.5 + 0.8 * mood_intensity),
+        pastel_grain=pastel_grain * factor,
+        pastel_blend=pastel_blend * (0.6 + 0.3 * emotion_link),
+    )
+
+
+def _render_background(
+    palette,
+    mood_intensity: float,
+    seed: int,
+    emotion_link: float,
+    mist_strength: float,
+    mist_smoothness: float,
+    mist_glow: float,
+    wc_spread: float,
+    wc_layers: int,
+    wc_saturation: float,
+    pastel_softness: float,
+    pastel_grain: float,
+    pastel_blend: float,
+    backend=None,
+    size: int = BASE_SIZE,
+) -> Image.Image:
+    """Seed the RNGs and render the layered background."""
+    seed_int = _seed_int(seed)
+    np.random.seed(seed_int)
+    random.seed(seed_int)
+
+    style = _modulate_style(
+        mood_intensity, emotion_link, mist_strength, wc_spread, wc_layers, pastel_softness, pastel_grain, pastel_blend
+    )
+
+    backend = get_backend(backend)
+
+    # Base gradient
+    base = _generate_base_gradient(size=size, palette=palette, mood_intensity=mood_intensity, backend=backend)
+
+    # Render visual layers
+    base = _apply_mist_layer(
+        base, strength=style["mist_strength"], smoothness=mist_smoothness, glow=mist_glow, backend=backend
+    )
+
+    base = _apply_watercolor_layer(
+        img=base,
+        palette=palette,
+        spread=style["wc_spread"],
+        layers=style["wc_layers"],
+        saturation=wc_saturation,
+    )
+
+    base = _apply_pastel_layer(
+        img=base,
+        softness=style["pastel_softness"],
+        grain_amount=style["pastel_grain"],
+        blend_ratio=style["pastel_blend"],
+        backend=backend,
+    )
+
+    return base
+
+
 # ---------------------------------------------------------
 # Main: Poster Generation Pipeline
 # ---------------------------------------------------------
@@ -437,6 +689,10 @@ def generate_poster(
     pastel_softness: float,
     pastel_grain: float,
     pastel_blend: float,
+    backend: Union[str, NumpyBackend, None] = None,
+    output_format: str = "png",
+    vector_background_size: int = 512,
+    size: int = BASE_SIZE,
 ) -> bytes:
     """
     Fully local poster generator:
@@ -444,50 +700,275 @@ def generate_poster(
     - Uses three layered styles: Mist, Watercolor, and Pastel.
     - Automatically derives city style overlays from keywords in city + memory_text.
     - emotion_link controls how strongly mood affects the final visual output.
+    - backend selects the compute backend, by name ("numpy", "numba" or
+      "auto") or as a backend instance; unavailable backends fall back to numpy.
+    - size is the square canvas edge in px; pixel constants scale with it.
+    - output_format "png" returns the rendered poster; "svg" or "json" return
+      the city overlay as vector geometry over the raster background, which is
+      embedded at vector_background_size px so prints can scale cheaply.
+      In the PNG, overlapping overlay shapes overwrite each other; SVG
+      viewers alpha-blend them, so overlaps (e.g. neon bars over pixel-grid
+      cells) look denser there. The JSON marks this as "composite": "replace".
     """
-    try:
-        seed_int = int(seed)
-    except Exception:
-        seed_int = 42
+    output_format = output_format.lower()
+    if output_format not in ("png", "svg", "json"):
+        raise ValueError(f"Unsupported output_format: {output_format!r}")
 
-    np.random.seed(seed_int)
-    random.seed(seed_int)
+    base = _render_background(
+        palette=palette,
+        mood_intensity=mood_intensity,
+        seed=seed,
+        emotion_link=emotion_link,
+        mist_strength=mist_strength,
+        mist_smoothness=mist_smoothness,
+        mist_glow=mist_glow,
+        wc_spread=wc_spread,
+        wc_layers=wc_layers,
+        wc_saturation=wc_saturation,
+        pastel_softness=pastel_softness,
+        pastel_grain=pastel_grain,
+        pastel_blend=pastel_blend,
+        backend=backend,
+        size=size,
+    )
 
-    # Emotion-driven strength modulation
-    factor = 0.35 + 0.65 * emotion_link
-    mist_strength *= factor * (0.7 + 0.6 * mood_intensity)
-    wc_spread *= factor * (0.6 + 0.7 * mood_intensity)
-    wc_layers = max(1, int(wc_layers * (0.6 + 0.8 * mood_intensity)))
-    pastel_softness *= factor * (0.5 + 0.8 * mood_intensity)
-    pastel_grain *= factor
-    pastel_blend *= 0.6 + 0.3 * emotion_link
+    # City-specific style layer
+    tags = _detect_city_tags(city, memory_text)
+    city_strength = 0.45 + 0.55 * emotion_link
 
-    size = 1024
+    if output_format == "png":
+        base = _apply_city_style_layer(base, city, palette, tags, city_strength)
+        return _to_image_bytes(base)
 
-    # Base gradient
-    base = _generate_base_gradient(size=size, palette=palette, mood_intensity=mood_intensity)
+    ops = _city_style_display_list(size, size, city, palette, tags, city_strength)
+    if output_format == "svg":
+        return _display_list_to_svg(base, ops, vector_background_size)
+    return _display_list_to_json(base, ops, vector_background_size)
 
-    # Render visual layers
-    base = _apply_mist_layer(base, strength=mist_strength, smoothness=mist_smoothness, glow=mist_glow)
 
-    base = _apply_watercolor_layer(
-        img=base,
-        palette=palette,
-        spread=wc_spread,
-        layers=wc_layers,
-        saturation=wc_saturation,
+# ---------------------------------------------------------
+# Composite: Multi-Panel Posters
+# ---------------------------------------------------------
+# The seam pass only evens out texture across panel edges; full-strength
+# mist on top of each panel's own mist would leave foggy bands.
+SEAM_MIST_RATIO = 0.3
+SEAM_FEATHER = 0.08  # fraction of panel_size
+
+# One worker pool for all composite calls and backends (jobs carry the backend name)
+_PANEL_POOL: Optional[ProcessPoolExecutor] = None
+_PANEL_POOL_LOCK = threading.Lock()
+
+
+def _init_panel_worker() -> None:
+    """Panels already run one per core; keep each worker's numba kernels single-threaded."""
+    set_num_threads(1)
+
+
+def _get_panel_pool() -> ProcessPoolExecutor:
+    global _PANEL_POOL
+    with _PANEL_POOL_LOCK:
+        if _PANEL_POOL is None:
+            # spawn, not fork: the numba thread pool is not fork-safe
+            _PANEL_POOL = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_panel_worker,
+            )
+        return _PANEL_POOL
+
+
+@atexit.register
+def _shutdown_panel_pool() -> None:
+    global _PANEL_POOL
+    with _PANEL_POOL_LOCK:
+        if _PANEL_POOL is not None:
+            _PANEL_POOL.shutdown(cancel_futures=True)
+            _PANEL_POOL = None
+
+
+def _panel_jobs(panels: List[dict], seed_int: int, panel_size: int, backend_name: str, **style) -> List[dict]:
+    """One _render_panel job per panel; panel i defaults to seed_int + i."""
+    jobs = []
+    for i, panel in enumerate(panels):
+        jobs.append(dict(
+            city=panel["city"],
+            memory_text=panel["memory_text"],
+            palette=_normalize_palette(panel["palette"]),
+            mood_intensity=panel["intensity"],
+            seed=panel.get("seed", seed_int + i),
+            backend=backend_name,
+            size=panel_size,
+            **style,
+        ))
+    return jobs
+
+
+def _render_panel(job: dict) -> np.ndarray:
+    """Render one panel (background + city overlay) as an RGB array."""
+    job = dict(job)
+    city = job.pop("city")
+    memory_text = job.pop("memory_text")
+
+    base = _render_background(**job)
+    tags = _detect_city_tags(city, memory_text)
+    city_strength = 0.45 + 0.55 * job["emotion_link"]
+    base = _apply_city_style_layer(base, city, job["palette"], tags, city_strength)
+    return np.asarray(base)
+
+
+def _seam_weight(rows: int, cols: int, panel_size: int, feather: float) -> np.ndarray:
+    """Per-pixel weight in [0, 1]: 1 on inner panel seams, fading to 0 over `feather` px."""
+    h, w = rows * panel_size, cols * panel_size
+    feather = max(feather, 1.0)
+
+    def axis_dist(n: int, length: int) -> np.ndarray:
+        coords = np.arange(length, dtype="float32")
+        seams = np.arange(1, n, dtype="float32") * panel_size
+        if not len(seams):
+            return np.full(length, np.inf, dtype="float32")
+        return np.abs(coords[:, None] - seams[None, :]).min(axis=1)
+
+    dist = np.minimum(axis_dist(rows, h)[:, None], axis_dist(cols, w)[None, :])
+    return np.clip(1.0 - dist / feather, 0.0, 1.0)
+
+
+def _seam_boxes(rows: int, cols: int, panel_size: int, reach: int) -> List[Tuple[int, int, int, int]]:
+    """Crop boxes covering every inner seam, `reach` px to each side."""
+    h, w = rows * panel_size, cols * panel_size
+    boxes = []
+    for r in range(1, rows):
+        y = r * panel_size
+        boxes.append((0, max(0, y - reach), w, min(h, y + reach)))
+    for c in range(1, cols):
+        x = c * panel_size
+        boxes.append((max(0, x - reach), 0, min(w, x + reach), h))
+    return boxes
+
+
+def _unified_pass(img: Image.Image, style: dict, mist_smoothness: float, backend, scale: float) -> Image.Image:
+    """Light mist + the panels' pastel pass, scaled like a single panel."""
+    img = _apply_mist_layer(
+        img,
+        strength=style["mist_strength"] * SEAM_MIST_RATIO,
+        smoothness=mist_smoothness,
+        glow=0.0,
+        backend=backend,
+        scale=scale,
+    )
+    return _apply_pastel_layer(
+        img,
+        softness=style["pastel_softness"],
+        grain_amount=style["pastel_grain"],
+        blend_ratio=style["pastel_blend"],
+        backend=backend,
+        scale=scale,
     )
 
-    base = _apply_pastel_layer(
-        img=base,
-        softness=pastel_softness,
-        grain_amount=pastel_grain,
-        blend_ratio=pastel_blend,
+
+def generate_composite_poster(
+    panels: List[dict],
+    rows: int,
+    cols: int,
+    seed: int,
+    emotion_link: float,
+    mist_strength: float,
+    mist_smoothness: float,
+    mist_glow: float,
+    wc_spread: float,
+    wc_layers: int,
+    wc_saturation: float,
+    pastel_softness: float,
+    pastel_grain: float,
+    pastel_blend: float,
+    panel_size: Optional[int] = None,
+    backend: Union[str, NumpyBackend, None] = None,
+    max_workers: Optional[int] = None,
+    seam_floor: float = 0.0,
+) -> bytes:
+    """
+    Lay out several city/memory panels (triptychs, grids) in one poster:
+
+    - Each panel is a dict with city, memory_text, mood, palette and intensity
+      (e.g. an analyze_memory_local result plus its memory_text), and an
+      optional seed; the style sliders are shared across panels.
+    - Panels render at panel_size (default: BASE_SIZE // max(rows, cols), so
+      a grid costs about one full-size render in total). max_workers=1
+      renders in-process; otherwise panels run on a shared process pool
+      sized to the CPU count (the default when there are several cores).
+    - A unified mist + pastel pass, emotion-modulated and scaled like a panel,
+      is blended in along the seams; seam_floor sets its weight elsewhere
+      (0 keeps the pass to strips around the seams).
+    """
+    if rows < 1 or cols < 1 or len(panels) != rows * cols:
+        raise ValueError(f"Expected {rows} x {cols} panels, got {len(panels)}")
+
+    seed_int = _seed_int(seed)
+    if panel_size is None:
+        panel_size = BASE_SIZE // max(rows, cols)
+    backend = get_backend(backend)
+
+    jobs = _panel_jobs(
+        panels,
+        seed_int,
+        panel_size,
+        backend.name,
+        emotion_link=emotion_link,
+        mist_strength=mist_strength,
+        mist_smoothness=mist_smoothness,
+        mist_glow=mist_glow,
+        wc_spread=wc_spread,
+        wc_layers=wc_layers,
+        wc_saturation=wc_saturation,
+        pastel_softness=pastel_softness,
+        pastel_grain=pastel_grain,
+        pastel_blend=pastel_blend,
     )
 
-    # City-specific style layer
-    tags = _detect_city_tags(city, memory_text)
-    city_strength = 0.45 + 0.55 * emotion_link
-    base = _apply_city_style_layer(base, city, palette, tags, city_strength)
+    if max_workers is None:
+        max_workers = min(len(jobs), os.cpu_count() or 1)
 
-    return _to_image_bytes(base)
+    if max_workers <= 1:
+        rendered = [_render_panel(job) for job in jobs]
+    else:
+        try:
+            rendered = list(_get_panel_pool().map(_render_panel, jobs))
+        except BrokenProcessPool:
+            _shutdown_panel_pool()
+            raise
+
+    # Stitch panels
+    canvas = np.empty((rows * panel_size, cols * panel_size, 3), dtype="uint8")
+    for i, arr in enumerate(rendered):
+        r, c = divmod(i, cols)
+        canvas[r * panel_size:(r + 1) * panel_size, c * panel_size:(c + 1) * panel_size] = arr
+    canvas = Image.fromarray(canvas, mode="RGB")
+
+    # Unified pass across seams, modulated and scaled like a single panel
+    np.random.seed(seed_int)
+    random.seed(seed_int)
+
+    mean_intensity = float(np.mean([panel["intensity"] for panel in panels]))
+    style = _modulate_style(
+        mean_intensity, emotion_link, mist_strength, wc_spread, wc_layers, pastel_softness, pastel_grain, pastel_blend
+    )
+    scale = panel_size / BASE_SIZE
+
+    feather = panel_size * SEAM_FEATHER
+    weight = seam_floor + (1.0 - seam_floor) * _seam_weight(rows, cols, panel_size, feather)
+    mask = Image.fromarray((weight * 255).astype("uint8"), mode="L")
+
+    if seam_floor > 0:
+        unified = _unified_pass(canvas, style, mist_smoothness, backend, scale)
+        return _to_image_bytes(Image.composite(unified, canvas, mask))
+
+    # Seam-local: process strips padded by twice the largest blur radius.
+    # Each strip blends against the untouched canvas, so crossings blend once.
+    blur = max((15 + mist_smoothness * 25) * scale, (1.5 + style["pastel_softness"] * 6) * scale)
+    reach = int(np.ceil(feather + 2 * blur))
+    result = canvas.copy()
+    for box in _seam_boxes(rows, cols, panel_size, reach):
+        strip = canvas.crop(box)
+        unified = _unified_pass(strip, style, mist_smoothness, backend, scale)
+        result.paste(Image.composite(unified, strip, mask.crop(box)), box[:2])
+
+    return _to_image_bytes(result)
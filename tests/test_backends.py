@@ -0,0 +1,67 @@
+import random
+
+import numpy as np
+import pytest
+
+from backends import NumbaBackend, NumpyBackend, available_backends
+
+requires_numba = pytest.mark.skipif("numba" not in available_backends(), reason="numba not installed")
+
+
+def _reference_gradient(size, c1, c2, c3, mood_intensity):
+    """The original per-pixel gradient loop."""
+
+    def lerp(a, b, t):
+        return tuple(int(a[i] * (1 - t) + b[i] * t) for i in range(3))
+
+    w = h = size
+    arr = np.zeros((h, w, 3), dtype=np.uint8)
+    for y in range(h):
+        for x in range(w):
+            tx = x / (w - 1)
+            ty = y / (h - 1)
+            d_center = ((x - w / 2) ** 2 + (y - h / 2) ** 2) ** 0.5 / (0.75 * w)
+            d_center = max(0.0, min(1.0, d_center))
+            c_diag = lerp(c1, c2, (tx + ty) / 2.0)
+            factor = (1.0 - d_center) * 0.8 * (0.4 + 0.6 * mood_intensity)
+            arr[y, x, :] = lerp(c_diag, c3, factor)
+    return arr
+
+
+def _random_gradient_cases(n, seed=0):
+    rng = random.Random(seed)
+    for _ in range(n):
+        colors = [tuple(rng.randint(0, 255) for _ in range(3)) for _ in range(3)]
+        yield (rng.randint(2, 120), *colors, rng.random())
+
+
+@pytest.mark.parametrize("case", list(_random_gradient_cases(10)))
+def test_numpy_gradient_matches_reference(case):
+    np.testing.assert_array_equal(NumpyBackend().gradient(*case), _reference_gradient(*case))
+
+
+@requires_numba
+@pytest.mark.parametrize("case", list(_random_gradient_cases(40, seed=1)))
+def test_numba_gradient_matches_numpy(case):
+    np.testing.assert_array_equal(NumbaBackend().gradient(*case), NumpyBackend().gradient(*case))
+
+
+@requires_numba
+@pytest.mark.parametrize("seed", range(10))
+def test_numba_scale_clip_matches_numpy(seed):
+    rng = np.random.default_rng(seed)
+    arr = rng.integers(0, 256, (rng.integers(1, 64), rng.integers(1, 64), 3), dtype=np.uint8)
+    gain = float(rng.uniform(0.5, 1.5))
+    np.testing.assert_array_equal(NumbaBackend().scale_clip(arr, gain), NumpyBackend().scale_clip(arr, gain))
+
+
+@requires_numba
+@pytest.mark.parametrize("seed", range(10))
+def test_numba_lift_grain_matches_numpy(seed):
+    rng = np.random.default_rng(seed)
+    h, w = rng.integers(1, 64, size=2)
+    arr = rng.integers(0, 256, (h, w, 3), dtype=np.uint8)
+    noise = rng.normal(0, 12, (h, w, 1)).astype("float32")
+    gain = float(rng.uniform(0.9, 1.2))
+    for n in (noise, None):
+        np.testing.assert_array_equal(NumbaBackend().lift_grain(arr, gain, n), NumpyBackend().lift_grain(arr, gain, n))
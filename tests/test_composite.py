@@ -0,0 +1,57 @@
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from poster_generator import SEAM_FEATHER, _panel_jobs, _render_panel, generate_composite_poster
+
+STYLE = dict(
+    emotion_link=0.7,
+    mist_strength=0.6,
+    mist_smoothness=0.7,
+    mist_glow=0.4,
+    wc_spread=0.45,
+    wc_layers=2,
+    wc_saturation=0.6,
+    pastel_softness=0.5,
+    pastel_grain=0.25,
+    pastel_blend=0.6,
+)
+
+PANELS = [
+    dict(city="Tokyo", memory_text="anime night", mood="dreamy", palette=[(120, 160, 200), (90, 110, 150)], intensity=0.6),
+    dict(city="Paris", memory_text="cafe", mood="romantic", palette=[(220, 200, 180), (250, 210, 220)], intensity=0.5),
+    dict(city="London", memory_text="rain", mood="nostalgic", palette=[(180, 180, 190)], intensity=0.55),
+    dict(city="Busan", memory_text="beach", mood="calm", palette=[(150, 200, 210), (90, 160, 170)], intensity=0.7),
+]
+
+PANEL_SIZE = 64
+
+
+def _composite(**kwargs):
+    return generate_composite_poster(PANELS, 2, 2, seed=11, panel_size=PANEL_SIZE, **STYLE, **kwargs)
+
+
+def test_panel_count_mismatch_raises():
+    with pytest.raises(ValueError):
+        generate_composite_poster(PANELS[:3], 2, 2, seed=11, **STYLE)
+
+
+def test_pool_matches_in_process():
+    assert _composite(max_workers=1) == _composite(max_workers=2)
+
+
+def test_pixels_away_from_seams_match_standalone_panels():
+    canvas = np.asarray(Image.open(io.BytesIO(_composite(max_workers=1, seam_floor=0.0))))
+    jobs = _panel_jobs(PANELS, 11, PANEL_SIZE, "numpy", **STYLE)
+    margin = int(np.ceil(PANEL_SIZE * SEAM_FEATHER))
+
+    for i, job in enumerate(jobs):
+        r, c = divmod(i, 2)
+        panel = _render_panel(job)
+        got = canvas[r * PANEL_SIZE:(r + 1) * PANEL_SIZE, c * PANEL_SIZE:(c + 1) * PANEL_SIZE]
+        # Interior of each panel, clear of the inner seams (outer edges have no seam)
+        ys = slice(0 if r == 0 else margin, PANEL_SIZE - margin if r == 0 else PANEL_SIZE)
+        xs = slice(0 if c == 0 else margin, PANEL_SIZE - margin if c == 0 else PANEL_SIZE)
+        np.testing.assert_array_equal(got[ys, xs], panel[ys, xs])
@@ -0,0 +1,143 @@
+import json
+import random
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw, ImageFilter
+
+from poster_generator import _apply_city_style_layer, _city_accent_palette, generate_poster
+
+PALETTE = [(120, 160, 200), (220, 200, 180), (90, 110, 150)]
+ALL_TAGS = ["waves", "vertical_neon", "pixel_grid", "arches", "chaos_lines", "fog_overlay"]
+
+STYLE = dict(
+    mood="calm",
+    palette=PALETTE,
+    mood_intensity=0.6,
+    seed=7,
+    emotion_link=0.7,
+    mist_strength=0.6,
+    mist_smoothness=0.7,
+    mist_glow=0.4,
+    wc_spread=0.45,
+    wc_layers=2,
+    wc_saturation=0.6,
+    pastel_softness=0.5,
+    pastel_grain=0.25,
+    pastel_blend=0.6,
+)
+
+
+def _reference_city_style_layer(img, city, palette, tags, strength):
+    """The original single-pass city overlay, drawn straight onto ImageDraw."""
+    palette = _city_accent_palette(city, palette)
+    w, h = img.size
+    base = img.convert("RGB")
+    overlay = Image.new("RGBA", (w, h), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(overlay)
+
+    def pick_color(vivid=False):
+        c = random.choice(palette)
+        if vivid:
+            arr = np.clip(np.array([[list(c)]], dtype="float32") * 1.15, 0, 255).astype("uint8")
+            return tuple(int(v) for v in arr[0, 0])
+        return c
+
+    if "waves" in tags:
+        for i in range(4):
+            color = pick_color()
+            alpha = int(45 + 80 * strength)
+            thickness = int(8 + 35 * strength)
+            y0 = int(h * (0.3 + 0.4 * i / 4))
+            for x in range(0, w, 6):
+                y = y0 + int(np.sin(x / 40.0 + i) * 18)
+                draw.line([(x, y), (x + 10, y)], fill=(*color, alpha), width=thickness)
+
+    if "vertical_neon" in tags:
+        for _ in range(int(8 + 12 * strength)):
+            color = pick_color(vivid=True)
+            alpha = int(120 + 120 * strength)
+            x = random.randint(0, w)
+            top = random.randint(0, int(h * 0.1))
+            bottom = random.randint(int(h * 0.6), h)
+            width = random.randint(6, 16)
+            draw.rectangle((x, top, x + width, bottom), fill=(*color, alpha))
+
+    if "pixel_grid" in tags:
+        cell = int(18 - 10 * strength) if strength > 0 else 18
+        for y in range(0, h, cell):
+            for x in range(0, w, cell):
+                if random.random() < 0.23 + 0.35 * strength:
+                    color = pick_color(vivid=True)
+                    alpha = int(80 + 120 * strength)
+                    draw.rectangle((x, y, x + cell, y + cell), fill=(*color, alpha))
+
+    if "arches" in tags:
+        base_y = int(h * 0.78)
+        for i in range(int(3 + 4 * strength)):
+            color = pick_color()
+            alpha = int(70 + 100 * strength)
+            width = int(w * 0.16)
+            gap = int(w * 0.04)
+            x_center = int(w * 0.18 + i * (width + gap))
+            left = x_center - width // 2
+            right = x_center + width // 2
+            top = int(h * (0.38 + 0.1 * random.random()))
+            draw.rectangle((left, (top + base_y) // 2, right, base_y), fill=(*color, alpha))
+            draw.ellipse((left, top, right, top + (base_y - top) // 2), fill=(*color, alpha))
+
+    if "chaos_lines" in tags:
+        for _ in range(int(35 + 45 * strength)):
+            color = pick_color(vivid=True)
+            alpha = int(60 + 150 * strength)
+            x1 = random.randint(0, w)
+            y1 = random.randint(0, h)
+            x2 = x1 + random.randint(-110, 110)
+            y2 = y1 + random.randint(-90, 90)
+            draw.line((x1, y1, x2, y2), fill=(*color, alpha), width=random.randint(1, 4))
+
+    if "fog_overlay" in tags:
+        fog = Image.fromarray((np.random.rand(h, w).astype("float32") * 255).astype("uint8"), mode="L")
+        fog = fog.filter(ImageFilter.GaussianBlur(radius=35))
+        overlay = Image.alpha_composite(overlay, Image.merge("RGBA", (fog, fog, fog, fog)))
+
+    overlay = overlay.filter(ImageFilter.GaussianBlur(radius=3.0))
+    return Image.alpha_composite(base.convert("RGBA"), overlay).convert("RGB")
+
+
+@pytest.mark.parametrize("tags", [ALL_TAGS, ["pixel_grid", "vertical_neon"], ["arches", "fog_overlay"]])
+@pytest.mark.parametrize("city", ["Tokyo", "Paris", "Lisbon"])
+def test_city_style_layer_matches_reference(city, tags):
+    background = Image.new("RGB", (1024, 1024), (180, 190, 210))
+
+    results = []
+    for layer in (_reference_city_style_layer, _apply_city_style_layer):
+        random.seed(3)
+        np.random.seed(3)
+        results.append(np.asarray(layer(background, city, PALETTE, tags, 0.8)))
+
+    np.testing.assert_array_equal(results[0], results[1])
+
+
+def test_svg_export_parses_and_declares_xlink():
+    svg = generate_poster(city="Tokyo London", memory_text="anime, fog", output_format="svg", size=128, **STYLE)
+
+    root = ET.fromstring(svg)
+    assert b'xmlns:xlink="http://www.w3.org/1999/xlink"' in svg
+    images = [e for e in root.iter() if e.tag.endswith("image")]
+    assert len(images) == 2  # background + fog
+    assert all(e.get("{http://www.w3.org/1999/xlink}href", "").startswith("data:image/png;base64,") for e in images)
+
+
+def test_json_export_round_trips():
+    data = json.loads(generate_poster(city="Tokyo", memory_text="anime", output_format="json", size=128, **STYLE))
+
+    assert (data["width"], data["height"]) == (128, 128)
+    assert data["composite"] == "replace"
+    assert {op["op"] for op in data["ops"]} >= {"rect", "cells"}
+
+
+def test_unknown_output_format_raises():
+    with pytest.raises(ValueError):
+        generate_poster(city="Tokyo", memory_text="anime", output_format="pdf", **STYLE)